@@ -1,76 +1,139 @@
+import atexit
+import functools
 import http.client
-import json
+import logging
+import logging.handlers
+import queue
+import socket
+import threading
+
+import orjson
 
 # Constants for server configuration
 HOSTNAME = '192.168.0.130'
 PORT = 8080
 TIMEOUT = 2
 
-def validate_channel_id(channel_name):
-    try:
-        if channel_name is None:
-            return False
+# Resolve the server's address once rather than on every connection
+ADDRESS = socket.gethostbyname(HOSTNAME)
+
+# Diagnostics are handed to a queue and written to stderr by a background thread, keeping the
+# terminal I/O out of the request path
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
 
-        # Define the schema to validate against
-        schema = {
-            "$schema": "http://json-schema.org/draft-07/schema#",
-            "type": "object",
-            "required": ["channel_name"],
-            "properties": {
-                "channel_name": {
-                    "type": "string",
-                    "maxLength": 64,
-                    "pattern": "^[a-zA-Z0-9-_' ]*$"
-                }
-            },
-            "additionalProperties": False
+# Define the schema to validate against
+schema = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["channel_name"],
+    "properties": {
+        "channel_name": {
+            "type": "string",
+            "maxLength": 64,
+            "pattern": "^[a-zA-Z0-9-_' ]*$"
         }
+    },
+    "additionalProperties": False
+}
 
-        # Define the schema path and data
-        schema_path = 'validate_channel_id.json'
-        headers = {'Content-Type': 'application/json'}
+# Local copy of the channel_name rules, so names that can't pass are rejected without a request
+CHANNEL_NAME_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_' "
 
-        # First request to save the schema to the server
-        try:
-            conn = http.client.HTTPConnection(HOSTNAME, PORT, timeout=TIMEOUT)
-            conn.request('POST', f'/schema/{schema_path}', body=json.dumps(schema), headers=headers)
-            save_schema_response = conn.getresponse()
-            save_schema_response_data = save_schema_response.read().decode()
-            print(f"Save Schema Response: {save_schema_response.status}, {save_schema_response_data}")
-        except Exception as e:
-            print(f"Save schema request failed: {e}")
+def is_possible_channel_name(channel_name):
+    # translate() deletes every allowed character in C, anything left over is not allowed
+    return (
+        isinstance(channel_name, str)
+        and len(channel_name) <= 64
+        and channel_name.isascii()
+        and not channel_name.encode('ascii').translate(None, CHANNEL_NAME_CHARS)
+    )
+schema_body = orjson.dumps(schema)
+
+# Define the schema path and headers
+schema_path = 'validate_channel_id.json'
+headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+
+# The server writes its passing response compactly as {"result":"Validation passed"}, so success is
+# recognised from the raw bytes without decoding the body
+VALIDATION_PASSED = b'"result":"Validation passed"'
+
+# Schemas already saved to the server by this process, they only need uploading once
+schemas_uploaded = set()
+schemas_uploaded_lock = threading.Lock()
+
+# A single persistent HTTP/1.1 connection, reused across requests
+conn = http.client.HTTPConnection(ADDRESS, PORT, timeout=TIMEOUT)
+
+def post(path, body, headers):
+    global conn
+    try:
+        conn.request('POST', path, body=body, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+    except (http.client.HTTPException, ConnectionError):
+        # The server may have dropped the kept-alive connection, reconnect once and retry
+        conn.close()
+        conn = http.client.HTTPConnection(ADDRESS, PORT, timeout=TIMEOUT)
+        conn.request('POST', path, body=body, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+
+@functools.lru_cache(maxsize=4096)
+def cached_validate(schema_path, channel_name):
+    # Failed requests raise rather than return so that they are never cached
+    validate_data = {"channel_name": channel_name}
+    validate_response, validate_response_data = post(f'/validate/{schema_path}', orjson.dumps(validate_data), headers)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Validate Response: %s, %s", validate_response.status, validate_response_data.decode())
+
+    # Check the response from the server, 400 means the data failed validation
+    if validate_response.status == 200:
+        return VALIDATION_PASSED in validate_response_data
+    if validate_response.status == 400:
+        return False
+    raise http.client.HTTPException(f"Unexpected response status {validate_response.status}")
+
+def validate_channel_id(channel_name):
+    try:
+        if channel_name is None:
             return False
-        finally:
-            conn.close()
 
-        if save_schema_response.status != 200:
+        # The server remains the source of truth, only names that pass locally are sent to it
+        if not is_possible_channel_name(channel_name):
             return False
 
-        # Second request to validate the data against the schema
-        validate_data = {"channel_name": channel_name}
+        # First request to save the schema to the server, skipped once it has been uploaded
+        with schemas_uploaded_lock:
+            if schema_path not in schemas_uploaded:
+                try:
+                    save_schema_response, save_schema_response_data = post(f'/schema/{schema_path}', schema_body, headers)
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("Save Schema Response: %s, %s", save_schema_response.status, save_schema_response_data.decode())
+                except Exception as e:
+                    logger.error("Save schema request failed: %s", e)
+                    conn.close()
+                    return False
+
+                if save_schema_response.status != 200:
+                    return False
+                schemas_uploaded.add(schema_path)
+
+        # Second request to validate the data against the schema, answered from the cache for repeated names
         try:
-            conn = http.client.HTTPConnection(HOSTNAME, PORT, timeout=TIMEOUT)
-            conn.request('POST', f'/validate/{schema_path}', body=json.dumps(validate_data), headers=headers)
-            validate_response = conn.getresponse()
-            validate_response_data = validate_response.read().decode()
-            print(f"Validate Response: {validate_response.status}, {validate_response_data}")
+            return cached_validate(schema_path, channel_name)
         except Exception as e:
-            print(f"Validation request failed: {e}")
-            return False
-        finally:
+            logger.error("Validation request failed: %s", e)
             conn.close()
-
-        # Check the response from the server
-        if validate_response.status == 200:
-            result = json.loads(validate_response_data)
-            if result.get("result") == "Validation passed":
-                return True
-            else:
-                return False
-        else:
             return False
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return False
 
 # Example usage:
@@ -0,0 +1,129 @@
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+
+import aiohttp
+
+# Constants for server configuration
+HOSTNAME = '192.168.0.130'
+PORT = 8080
+TIMEOUT = 2
+
+# Diagnostics are handed to a queue and written to stderr by a background thread, keeping the
+# terminal I/O out of the request path
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Define the schema to validate against
+schema = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["channel_name"],
+    "properties": {
+        "channel_name": {
+            "type": "string",
+            "maxLength": 64,
+            "pattern": "^[a-zA-Z0-9-_' ]*$"
+        }
+    },
+    "additionalProperties": False
+}
+
+# Local copy of the channel_name rules, so names that can't pass are rejected without a request
+CHANNEL_NAME_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_' "
+
+def is_possible_channel_name(channel_name):
+    # translate() deletes every allowed character in C, anything left over is not allowed
+    return (
+        isinstance(channel_name, str)
+        and len(channel_name) <= 64
+        and channel_name.isascii()
+        and not channel_name.encode('ascii').translate(None, CHANNEL_NAME_CHARS)
+    )
+
+# Passing responses are always the compact {"result":"Validation passed"}, no need to decode them
+VALIDATION_PASSED = b'"result":"Validation passed"'
+
+# Define the schema path
+schema_path = 'validate_channel_id.json'
+
+async def save_schema(session):
+    # Save the schema to the server, this only needs doing once before the validations start
+    try:
+        async with session.post(f'http://{HOSTNAME}:{PORT}/schema/{schema_path}', json=schema) as save_schema_response:
+            save_schema_response_data = await save_schema_response.text()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Save Schema Response: %s, %s", save_schema_response.status, save_schema_response_data)
+            return save_schema_response.status == 200
+    except Exception as e:
+        logger.error("Save schema request failed: %s", e)
+        return False
+
+async def validate_channel_id_async(session, channel_name):
+    try:
+        if channel_name is None:
+            return False
+
+        # The server remains the source of truth, only names that pass locally are sent to it
+        if not is_possible_channel_name(channel_name):
+            return False
+
+        # Request to validate the data against the schema
+        validate_data = {"channel_name": channel_name}
+        try:
+            async with session.post(f'http://{HOSTNAME}:{PORT}/validate/{schema_path}', json=validate_data) as validate_response:
+                validate_response_data = await validate_response.read()
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Validate Response: %s, %s", validate_response.status, validate_response_data.decode())
+        except Exception as e:
+            logger.error("Validation request failed: %s", e)
+            return False
+
+        # Check the response from the server
+        return validate_response.status == 200 and VALIDATION_PASSED in validate_response_data
+    except Exception as e:
+        logger.error("An error occurred: %s", e)
+        return False
+
+async def main(channel_names):
+    # One session shares a pool of keep-alive connections between all of the concurrent requests,
+    # and the resolved address of the server is cached for an hour instead of re-resolving it
+    connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=30, use_dns_cache=True, ttl_dns_cache=3600)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        if not await save_schema(session):
+            return [False] * len(channel_names)
+        return await asyncio.gather(*[validate_channel_id_async(session, channel_name) for channel_name in channel_names])
+
+# Example usage:
+valid_channel_name1 = "valid_channel123"
+valid_channel_name2 = "another_valid_channel"
+valid_channel_name3 = "third_valid_channel"
+
+invalid_channel_name_too_long = "a" * 65  # 65 characters, exceeds the max length
+invalid_channel_name_invalid_chars = "invalid_channel!@#"
+invalid_channel_name_empty = ""
+invalid_channel_name_none = None
+
+channel_names = [
+    valid_channel_name1,
+    valid_channel_name2,
+    valid_channel_name3,
+    invalid_channel_name_too_long,
+    invalid_channel_name_invalid_chars,
+    invalid_channel_name_empty,
+    invalid_channel_name_none,
+]
+
+print("Testing channel names concurrently:")
+results = asyncio.run(main(channel_names))
+for channel_name, valid in zip(channel_names, results):
+    print(f"Is '{channel_name}' valid: {valid}")
@@ -1,64 +1,197 @@
+import atexit
+import functools
 import http.client
-import json
+import logging
+import logging.handlers
+import os
+import queue
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import fastjsonschema
+import orjson
 
 # Constants for server configuration
 HOSTNAME = '192.168.0.130'
 PORT = 8080
 TIMEOUT = 2
 
+# The schema is known here so validation is done locally, set YVM_REMOTE to have the server do it instead
+REMOTE = bool(os.environ.get('YVM_REMOTE'))
+
+# Resolve the server's address once rather than on every connection
+ADDRESS = socket.gethostbyname(HOSTNAME)
+
+# Diagnostics are handed to a queue and written to stderr by a background thread, keeping the
+# terminal I/O out of the request path
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Define the schema to validate against
+schema = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["channel_name"],
+    "properties": {
+        "channel_name": {
+            "type": "string",
+            "maxLength": 64,
+            "pattern": "^[a-zA-Z0-9-_' ]*$"
+        }
+    },
+    "additionalProperties": False
+}
+
+# Local copy of the channel_name rules, so names that can't pass are rejected without a request
+CHANNEL_NAME_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_' "
+
+def is_possible_channel_name(channel_name):
+    # translate() deletes every allowed character in C, anything left over is not allowed
+    return (
+        isinstance(channel_name, str)
+        and len(channel_name) <= 64
+        and channel_name.isascii()
+        and not channel_name.encode('ascii').translate(None, CHANNEL_NAME_CHARS)
+    )
+
+# The same schema applied to every element of an array, for validating many channel names at once
+batch_schema = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "array",
+    "items": {key: value for key, value in schema.items() if key != "$schema"}
+}
+
+# The schemas never change so serialize them once, each payload is then {"data": ..., "schema": ...}
+# assembled from these bytes and the serialized data
+schema_body = orjson.dumps(schema)
+batch_schema_body = orjson.dumps(batch_schema)
+headers = {'Content-Type': 'application/json'}
+
+# Compiled once into a plain Python function, used instead of the server unless REMOTE is set
+validate_locally = fastjsonschema.compile(schema)
+
+# The server writes its passing response compactly as {"result":"Validation passed"}, so success is
+# recognised from the raw bytes without decoding the body
+VALIDATION_PASSED = b'"result":"Validation passed"'
+
+# Each thread keeps its own persistent connection, so a connection is never shared mid-request
+local = threading.local()
+
+def post(path, body):
+    if getattr(local, "conn", None) is None:
+        local.conn = http.client.HTTPConnection(ADDRESS, PORT, timeout=TIMEOUT)
+    try:
+        local.conn.request('POST', path, body=body, headers=headers)
+        response = local.conn.getresponse()
+        return response, response.read()
+    except (http.client.HTTPException, ConnectionError):
+        # The server may have dropped the kept-alive connection, reconnect once and retry
+        local.conn.close()
+        local.conn = http.client.HTTPConnection(ADDRESS, PORT, timeout=TIMEOUT)
+        local.conn.request('POST', path, body=body, headers=headers)
+        response = local.conn.getresponse()
+        return response, response.read()
+
+def close_connection():
+    if getattr(local, "conn", None) is not None:
+        local.conn.close()
+        local.conn = None
+
+@functools.lru_cache(maxsize=4096)
+def channel_name_payload(channel_name):
+    # Repeated channel names reuse their already built request body
+    return b'{"data":' + orjson.dumps({"channel_name": channel_name}) + b',"schema":' + schema_body + b'}'
+
 def validate_channel_id(channel_name):
     try:
         if channel_name is None:
             return False
 
-        # Define the schema to validate against
-        schema = {
-            "$schema": "http://json-schema.org/draft-07/schema#",
-            "type": "object",
-            "required": ["channel_name"],
-            "properties": {
-                "channel_name": {
-                    "type": "string",
-                    "maxLength": 64,
-                    "pattern": "^[a-zA-Z0-9-_' ]*$"
-                }
-            },
-            "additionalProperties": False
-        }
+        # The server remains the source of truth, only names that pass locally are sent to it
+        if not is_possible_channel_name(channel_name):
+            return False
+
+        if not REMOTE:
+            try:
+                validate_locally({"channel_name": channel_name})
+                return True
+            except fastjsonschema.JsonSchemaException:
+                return False
 
         # Combine data and schema into a single request payload
-        validate_with_schema_payload = {
-            "data": {"channel_name": channel_name},
-            "schema": schema
-        }
-        headers = {'Content-Type': 'application/json'}
+        validate_with_schema_payload = channel_name_payload(channel_name)
 
         # Request to validate the data against the schema
         try:
-            conn = http.client.HTTPConnection(HOSTNAME, PORT, timeout=TIMEOUT)
-            conn.request('POST', '/validatewithschema', body=json.dumps(validate_with_schema_payload), headers=headers)
-            validate_response = conn.getresponse()
-            validate_response_data = validate_response.read().decode()
-            print(f"Validate Response: {validate_response.status}, {validate_response_data}")
+            validate_response, validate_response_data = post('/validatewithschema', validate_with_schema_payload)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Validate Response: %s, %s", validate_response.status, validate_response_data.decode())
         except Exception as e:
-            print(f"Validation request failed: {e}")
+            logger.error("Validation request failed: %s", e)
+            close_connection()
             return False
-        finally:
-            conn.close()
 
         # Check the response from the server
-        if validate_response.status == 200:
-            result = json.loads(validate_response_data)
-            if result.get("result") == "Validation passed":
-                return True
-            else:
-                return False
-        else:
-            return False
+        return validate_response.status == 200 and VALIDATION_PASSED in validate_response_data
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return False
 
+def validate_channel_ids(channel_names):
+    if not REMOTE:
+        return [validate_channel_id(channel_name) for channel_name in channel_names]
+
+    # Channel names that fail the local check are invalid without asking the server
+    results = [is_possible_channel_name(channel_name) for channel_name in channel_names]
+    indexes = [i for i, valid in enumerate(results) if valid]
+    if not indexes:
+        return results
+
+    try:
+        # Send all of the channel names to the server in a single request
+        batch_data = [{"channel_name": channel_names[i]} for i in indexes]
+        validate_with_schema_payload = b'{"data":' + orjson.dumps(batch_data) + b',"schema":' + batch_schema_body + b'}'
+
+        try:
+            validate_response, validate_response_data = post('/validatewithschema', validate_with_schema_payload)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Validate Response: %s, %s", validate_response.status, validate_response_data.decode())
+        except Exception as e:
+            logger.error("Validation request failed: %s", e)
+            close_connection()
+            return [False] * len(channel_names)
+
+        # Check the response from the server, failures are decoded to find which names failed
+        if validate_response.status == 200 and VALIDATION_PASSED in validate_response_data:
+            return results
+        result = orjson.loads(validate_response_data)
+        if result.get("result") != "Validation failed":
+            return [False] * len(channel_names)
+
+        # Each error is "<keyword location> <instance location>", the instance location
+        # starts with the index of the failing element in the data array e.g. "/2/channel_name"
+        failed = set()
+        for error in result.get("errors", []):
+            instance_location = error.rsplit(" ", 1)[-1]
+            if instance_location.startswith("/"):
+                failed.add(int(instance_location.split("/")[1]))
+        if not failed:
+            return [False] * len(channel_names)
+        for position, i in enumerate(indexes):
+            if position in failed:
+                results[i] = False
+        return results
+    except Exception as e:
+        logger.error("An error occurred: %s", e)
+        return [False] * len(channel_names)
+
 # Example usage:
 valid_channel_name1 = "valid_channel123"
 valid_channel_name2 = "another_valid_channel"
@@ -69,19 +202,20 @@ invalid_channel_name_invalid_chars = "invalid_channel!@#"
 invalid_channel_name_empty = ""
 invalid_channel_name_none = None
 
-print("Testing valid channel names:")
-print(f"Is '{valid_channel_name1}' valid: {validate_channel_id(valid_channel_name1)}")
-print(f"Is '{valid_channel_name2}' valid: {validate_channel_id(valid_channel_name2)}")
-print(f"Is '{valid_channel_name3}' valid: {validate_channel_id(valid_channel_name3)}")
-
-print("\nTesting invalid channel names (too long):")
-print(f"Is '{invalid_channel_name_too_long}' valid: {validate_channel_id(invalid_channel_name_too_long)}")
-
-print("\nTesting invalid channel names (invalid characters):")
-print(f"Is '{invalid_channel_name_invalid_chars}' valid: {validate_channel_id(invalid_channel_name_invalid_chars)}")
+channel_names = [
+    valid_channel_name1,
+    valid_channel_name2,
+    valid_channel_name3,
+    invalid_channel_name_too_long,
+    invalid_channel_name_invalid_chars,
+    invalid_channel_name_empty,
+    invalid_channel_name_none,
+]
 
-print("\nTesting invalid channel name (empty string):")
-print(f"Is '{invalid_channel_name_empty}' valid: {validate_channel_id(invalid_channel_name_empty)}")
+print("Testing channel names as a batch:")
+print("\n".join([f"Is '{channel_name}' valid: {valid}" for channel_name, valid in zip(channel_names, validate_channel_ids(channel_names))]))
 
-print("\nTesting invalid channel name (None):")
-print(f"Is '{invalid_channel_name_none}' valid: {validate_channel_id(invalid_channel_name_none)}")
+print("\nTesting channel names one at a time, in parallel:")
+with ThreadPoolExecutor(max_workers=8) as executor:
+    results = list(executor.map(validate_channel_id, channel_names))
+print("\n".join([f"Is '{channel_name}' valid: {valid}" for channel_name, valid in zip(channel_names, results)]))
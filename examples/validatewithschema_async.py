@@ -0,0 +1,135 @@
+import asyncio
+import atexit
+import functools
+import logging
+import logging.handlers
+import queue
+import socket
+
+import httpx
+import orjson
+
+# Constants for server configuration
+HOSTNAME = '192.168.0.130'
+PORT = 8080
+TIMEOUT = 2
+
+# Resolve the server's address once rather than on every connection
+ADDRESS = socket.gethostbyname(HOSTNAME)
+
+# Diagnostics are handed to a queue and written to stderr by a background thread, keeping the
+# terminal I/O out of the request path
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Define the schema to validate against
+schema = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["channel_name"],
+    "properties": {
+        "channel_name": {
+            "type": "string",
+            "maxLength": 64,
+            "pattern": "^[a-zA-Z0-9-_' ]*$"
+        }
+    },
+    "additionalProperties": False
+}
+
+# Local copy of the channel_name rules, so names that can't pass are rejected without a request
+CHANNEL_NAME_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_' "
+
+def is_possible_channel_name(channel_name):
+    # translate() deletes every allowed character in C, anything left over is not allowed
+    return (
+        isinstance(channel_name, str)
+        and len(channel_name) <= 64
+        and channel_name.isascii()
+        and not channel_name.encode('ascii').translate(None, CHANNEL_NAME_CHARS)
+    )
+
+# The schema never changes so serialize it once, each payload is then {"data": ..., "schema": ...}
+# assembled from these bytes and the serialized data
+schema_body = orjson.dumps(schema)
+headers = {'Content-Type': 'application/json'}
+
+# Matched against the raw response body, the server writes it compactly
+VALIDATION_PASSED = b'"result":"Validation passed"'
+
+# YouValidateMe serves plain HTTP/1.1, so requests in flight at the same time each need their own
+# connection, the client keeps a pool of them alive for reuse between bursts
+client = httpx.AsyncClient(
+    base_url=f'http://{ADDRESS}:{PORT}',
+    timeout=TIMEOUT,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
+@functools.lru_cache(maxsize=4096)
+def channel_name_payload(channel_name):
+    # Repeated channel names reuse their already built request body
+    return b'{"data":' + orjson.dumps({"channel_name": channel_name}) + b',"schema":' + schema_body + b'}'
+
+async def validate_channel_id(channel_name):
+    try:
+        if channel_name is None:
+            return False
+
+        # The server remains the source of truth, only names that pass locally are sent to it
+        if not is_possible_channel_name(channel_name):
+            return False
+
+        # Combine data and schema into a single request payload
+        validate_with_schema_payload = channel_name_payload(channel_name)
+
+        # Request to validate the data against the schema
+        try:
+            validate_response = await client.post('/validatewithschema', content=validate_with_schema_payload, headers=headers)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Validate Response: %s, %s", validate_response.status_code, validate_response.text)
+        except Exception as e:
+            logger.error("Validation request failed: %s", e)
+            return False
+
+        # Check the response from the server
+        return validate_response.status_code == 200 and VALIDATION_PASSED in validate_response.content
+    except Exception as e:
+        logger.error("An error occurred: %s", e)
+        return False
+
+async def main(channel_names):
+    try:
+        return await asyncio.gather(*[validate_channel_id(channel_name) for channel_name in channel_names])
+    finally:
+        await client.aclose()
+
+# Example usage:
+valid_channel_name1 = "valid_channel123"
+valid_channel_name2 = "another_valid_channel"
+valid_channel_name3 = "third_valid_channel"
+
+invalid_channel_name_too_long = "a" * 65  # 65 characters, exceeds the max length
+invalid_channel_name_invalid_chars = "invalid_channel!@#"
+invalid_channel_name_empty = ""
+invalid_channel_name_none = None
+
+channel_names = [
+    valid_channel_name1,
+    valid_channel_name2,
+    valid_channel_name3,
+    invalid_channel_name_too_long,
+    invalid_channel_name_invalid_chars,
+    invalid_channel_name_empty,
+    invalid_channel_name_none,
+]
+
+print("Testing channel names concurrently:")
+results = asyncio.run(main(channel_names))
+for channel_name, valid in zip(channel_names, results):
+    print(f"Is '{channel_name}' valid: {valid}")
@@ -1,11 +1,49 @@
-import http.client
-import json
+import atexit
+import logging
+import logging.handlers
+import queue
+import socket
+import threading
+
+import orjson
+import requests
+from blake3 import blake3
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 
 # Constants for server configuration
 HOSTNAME = '192.168.0.130'
 PORT = 8080
 TIMEOUT = 2
 
+# Resolve the server's address once rather than on every connection
+ADDRESS = socket.gethostbyname(HOSTNAME)
+
+# Diagnostics are handed to a queue and written to stderr by a background thread, keeping the
+# terminal I/O out of the request path
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+
+headers = {'Content-Type': 'application/json'}
+
+# The server's passing response, matched in the raw body instead of decoding it
+VALIDATION_PASSED = b'"result":"Validation passed"'
+
+# A pooled session, connections are kept alive and reused between requests
+session = requests.Session()
+session.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=100, max_retries=1))
+
+# Recent results keyed by a digest of the schema and data, bounded in size and expired after five
+# minutes so that old schemas are not remembered forever
+results_cache = TTLCache(maxsize=1024, ttl=300)
+results_cache_lock = threading.Lock()
+
 schema = {
   "$schema": "http://json-schema.org/draft-07/schema#",
   "type": "object",
@@ -33,6 +71,22 @@ data = {
 
 
 
+def request_validate(schema_json, data_json):
+    # Failed requests raise rather than return so that they are never cached
+    validate_with_schema_payload = b'{"data":' + data_json + b',"schema":' + schema_json + b'}'
+
+    # Request to validate the data against the schema
+    validate_response = session.post(f'http://{ADDRESS}:{PORT}/validatewithschema', data=validate_with_schema_payload, headers=headers, timeout=TIMEOUT)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Validate Response: %s, %s", validate_response.status_code, validate_response.text)
+
+    # Check the response from the server, 400 means the data or the schema failed validation
+    if validate_response.status_code == 200:
+        return VALIDATION_PASSED in validate_response.content
+    if validate_response.status_code == 400:
+        return False
+    raise requests.HTTPError(f"Unexpected response status {validate_response.status_code}", response=validate_response)
+
 def validate(schema, data):
     try:
         if data is None:
@@ -41,39 +95,25 @@ def validate(schema, data):
         if schema is None:
             return False
 
-        # Define the schema to validate against
-
-        # Combine data and schema into a single request payload
-        validate_with_schema_payload = {
-            "data": data,
-            "schema": schema
-        }
-        headers = {'Content-Type': 'application/json'}
+        # Serialize with sorted keys so that equal schemas and data share a cache entry
+        schema_json = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+        data_json = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        key = blake3(schema_json + b'|' + data_json).digest()
+        with results_cache_lock:
+            valid = results_cache.get(key)
+        if valid is not None:
+            return valid
 
-        # Request to validate the data against the schema
         try:
-            conn = http.client.HTTPConnection(HOSTNAME, PORT, timeout=TIMEOUT)
-            conn.request('POST', '/validatewithschema', body=json.dumps(validate_with_schema_payload), headers=headers)
-            validate_response = conn.getresponse()
-            validate_response_data = validate_response.read().decode()
-            print(f"Validate Response: {validate_response.status}, {validate_response_data}")
+            valid = request_validate(schema_json, data_json)
         except Exception as e:
-            print(f"Validation request failed: {e}")
-            return False
-        finally:
-            conn.close()
-
-        # Check the response from the server
-        if validate_response.status == 200:
-            result = json.loads(validate_response_data)
-            if result.get("result") == "Validation passed":
-                return True
-            else:
-                return False
-        else:
+            logger.error("Validation request failed: %s", e)
             return False
+        with results_cache_lock:
+            results_cache[key] = valid
+        return valid
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         return False
 
 